@@ -2,36 +2,76 @@
 Main pipeline: PDF → preprocessing → text → tables → images → equations → JSON
 """
 
-from src.parsers.table_extractor import extract_tables
-from src.parsers.image_parser import extract_images
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import ceil
+from typing import Dict, List, Any
+
+from src.parsers.combined import extract_all
 from src.parsers.equation_detector import detect_equations_in_text
 from src.slm.slm_model import tag
 from src.utils.unified_output import build_page_json, build_document_json
 
 import pdfplumber
 
+# Pages handed to a worker at a time — large enough to amortize pdfplumber.open
+PAGE_BLOCK_SIZE = 10
 
-def process_pdf(pdf_path: str):
-    pages_output = []
 
-    tables = extract_tables(pdf_path)
-    images = extract_images(pdf_path)
+def _get_max_workers(n_pages: int, block: int = PAGE_BLOCK_SIZE) -> int:
+    return max(1, min(os.cpu_count() or 1, ceil(n_pages / block)))
+
+
+def _process_block(pdf_path: str, page_indices: List[int]) -> List[Dict[str, Any]]:
+    """
+    Worker: one pdfplumber pass over the block's pages (0-based indices),
+    then text-equation detection per page.
+    """
+    # Only bboxes end up in the JSON — skip rasterizing the images
+    pages = extract_all(pdf_path, page_indices, columns=1, render_images=False)
+
+    return [
+        {
+            "page": page_num,
+            "text": page["text"],
+            "tables": page["tables"],
+            "images": page["images"],
+            "equations": detect_equations_in_text(page["text"])
+        }
+        for page_num, page in pages.items()
+    ]
+
 
+def process_pdf(pdf_path: str):
     with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text() or ""
-
-            equations = detect_equations_in_text(text)
-
-            pages_output.append(
-                build_page_json(
-                    page_num=i,
-                    text=text,
-                    tables=tables,
-                    images=images,
-                    equations=equations
-                )
-            )
+        n_pages = len(pdf.pages)
+
+    blocks = [list(range(start, min(start + PAGE_BLOCK_SIZE, n_pages)))
+              for start in range(0, n_pages, PAGE_BLOCK_SIZE)]
+
+    page_results = []
+    if len(blocks) <= 1:
+        # Short document — not worth a worker process
+        for block in blocks:
+            page_results.extend(_process_block(pdf_path, block))
+    else:
+        with ProcessPoolExecutor(max_workers=_get_max_workers(n_pages)) as executor:
+            futures = [executor.submit(_process_block, pdf_path, block) for block in blocks]
+            for future in as_completed(futures):
+                page_results.extend(future.result())
+
+    page_results.sort(key=lambda p: p["page"])
+
+    pages_output = [
+        build_page_json(
+            page_num=p["page"],
+            text=p["text"],
+            tables=p["tables"],
+            images=p["images"],
+            equations_text=p["equations"]
+        )
+        for p in page_results
+    ]
 
     return build_document_json(pages_output)
 
@@ -3,16 +3,24 @@ import json
 from PIL import Image
 import numpy as np
 
-from src.parsers.text_extractor import extract_text_from_pdf
-from src.parsers.table_extractor import extract_tables
-from src.parsers.image_parser import extract_images
-from src.parsers.equation_detector import detect_equations_in_text
-from src.parsers.image_equation_detector import detect_equations_in_image
+from src.pipeline import run_pipeline
+from src.preprocessing import ImagePreprocessor
 from src.utils.unified_output import build_page_json, build_document_json
 
 st.set_page_config(page_title="Document AI Pipeline", layout="wide")
 st.title("📄 Document AI Pipeline – Interactive Tester")
 
+
+@st.cache_resource
+def get_preprocessor():
+    # Loading the EasyOCR model is slow — keep one reader across reruns.
+    # Batched EasyOCR only pays off on a GPU; CPU-only hosts use Tesseract
+    # and skip loading (and downloading) the model entirely.
+    import torch
+    gpu = torch.cuda.is_available()
+    return ImagePreprocessor(use_easyocr=gpu, gpu=gpu)
+
+
 # ------------------- UPLOAD -------------------
 uploaded_file = st.file_uploader("Upload a PDF", type=["pdf"])
 if uploaded_file:
@@ -29,39 +37,43 @@ if uploaded_file:
     run_images = st.sidebar.checkbox("Image Extraction", value=True)
     run_eq_text = st.sidebar.checkbox("Text-based Equation Detection", value=True)
     run_eq_image = st.sidebar.checkbox("Image-based Equation Detection", value=True)
+    run_eq_ocr = st.sidebar.checkbox("OCR Detected Equations", value=False)
 
     # ------------------- PIPELINE -------------------
-    pages_text = extract_text_from_pdf(pdf_path) if run_text else []
-    tables = extract_tables(pdf_path) if run_tables else []
-    images = extract_images(pdf_path) if run_images else []
+    # parse → detect → OCR run as overlapping threaded stages (see src/pipeline.py)
+    ocr = get_preprocessor().ocr_crops if (run_eq_image and run_eq_ocr) else None
 
     st.info("Building Unified JSON...")
+    pages = {}
     page_json_list = []
-
-    for i, text in enumerate(pages_text, start=1):
-        # Tables and images for this page
-        page_tables = [t for t in tables if t["page"] == i]
-        page_images = [img for img in images if img["page"] == i]
-
-        # Equations
-        eq_text = detect_equations_in_text(text) if run_eq_text else []
-        eq_images = []
-        if run_eq_image:
-            for img in page_images:
-                eqs_in_img = detect_equations_in_image(img["numpy_array"])
-                eq_images.append({"image_bbox": img["bbox"], "equations": eqs_in_img})
+    image_eqs = []  # (image, detected equation boxes) across the whole document
+
+    for i, page in run_pipeline(pdf_path,
+                                eq_text=run_eq_text,
+                                eq_image=run_eq_image,
+                                ocr=ocr,
+                                text=run_text,
+                                tables=run_tables,
+                                images=run_images):
+        pages[i] = page
+        image_eqs.extend(page["image_eqs"])
 
         # Build page JSON
         page_json = build_page_json(
             page_num=i,
-            text=text,
-            tables=page_tables,
-            images=page_images,
-            equations_text=eq_text,
-            equations_img=eq_images
+            text=page["text"],
+            tables=page["tables"],
+            images=page["images"],
+            equations_text=page["equations_text"],
+            equations_img=[{"image_bbox": img["bbox"], "equations": boxes}
+                           for img, boxes in page["image_eqs"]]
         )
         page_json_list.append(page_json)
 
+    pages_text = [p["text"] for p in pages.values()] if run_text else []
+    tables = [t for p in pages.values() for t in p["tables"]]
+    images = [img for p in pages.values() for img in p["images"]]
+
     full_doc_json = build_document_json(page_json_list)
     st.success("Pipeline Completed!")
 
@@ -77,17 +89,15 @@ if uploaded_file:
             st.dataframe(t["as_dataframe"])
 
     st.header("🖼 Extracted Images & Equations")
+    # Index detected boxes by (page, bbox) instead of scanning every page per image
+    eq_boxes_by_image = {(img["page"], img["bbox"]): boxes for img, boxes in image_eqs}
     for img in images:
         with st.expander(f"Page {img['page']} – Image"):
-            st.image(img["numpy_array"], use_column_width=True)
+            st.image(img["image"], use_column_width=True)
             if run_eq_image:
                 # Draw boxes around detected equations
                 img_disp = img["numpy_array"].copy()
-                eq_boxes = []
-                for page_eq in full_doc_json["pages"]:
-                    for img_eq in page_eq["images"]:
-                        if img_eq["bbox"] == img["bbox"]:
-                            eq_boxes = img_eq["equations"][0]["equations"] if img_eq["equations"] else []
+                eq_boxes = eq_boxes_by_image.get((img["page"], img["bbox"]), [])
                 import cv2
                 for b in eq_boxes:
                     cv2.rectangle(img_disp, (b["x"], b["y"]),
@@ -1,3 +1,4 @@
 from .pdf_parser import extract_text_pages, extract_text_full, extract_metadata, extract_images, save_image_bytes
-from .table_extractor import extract_tables, extract_single_table
-from .equation_detector import detect_equations_in_image, detect_equations_from_pdf_page_image
+from .table_extractor import extract_tables, extract_page_tables, extract_single_table
+from .equation_detector import detect_equations_in_image, detect_equations_from_pdf_page_image, detect_equations_in_text
+from .combined import extract_all, extract_page
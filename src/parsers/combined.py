@@ -0,0 +1,68 @@
+"""
+src/parsers/combined.py
+
+Single-pass PDF extraction: text, tables and images are pulled from
+each pdfplumber page while it is loaded, instead of reopening and
+re-parsing the PDF once per extractor.
+"""
+
+from typing import Dict, Any, Iterable, Optional
+import pdfplumber
+
+from .text_extractor import extract_page_text
+from .table_extractor import extract_page_tables
+from .image_parser import extract_page_images
+
+
+def extract_page(page: pdfplumber.page.Page, page_num: int,
+                 columns: int = 2,
+                 text: bool = True,
+                 tables: bool = True,
+                 images: bool = True,
+                 render_images: bool = True) -> Dict[str, Any]:
+    """
+    Extract everything from one page.
+    Returns {"text": str, "tables": [...], "images": [...]}
+    (disabled components come back empty).
+    """
+    return {
+        "text": extract_page_text(page, columns) if text else "",
+        "tables": extract_page_tables(page, page_num) if tables else [],
+        "images": extract_page_images(page, page_num, render=render_images) if images else []
+    }
+
+
+def extract_all(pdf_path: str,
+                page_indices: Optional[Iterable[int]] = None,
+                **kwargs) -> Dict[int, Dict[str, Any]]:
+    """
+    Extract text, tables and images from a PDF in one pdfplumber pass.
+
+    Args:
+        pdf_path: Path to PDF file
+        page_indices: Optional 0-based page indices to process (default: all)
+        **kwargs: Forwarded to extract_page (columns, text, tables, images, render_images)
+
+    Returns:
+        {page_num: {"text": str, "tables": [...], "images": [...]}} with 1-based page numbers
+    """
+    results = {}
+
+    with pdfplumber.open(pdf_path) as pdf:
+        indices = range(len(pdf.pages)) if page_indices is None else page_indices
+        for idx in indices:
+            page_num = idx + 1
+            results[page_num] = extract_page(pdf.pages[idx], page_num, **kwargs)
+
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.parsers.combined <pdf_path>")
+    else:
+        pages = extract_all(sys.argv[1])
+        for page_num, page in pages.items():
+            print(f"Page {page_num}: {len(page['text'])} chars, "
+                  f"{len(page['tables'])} tables, {len(page['images'])} images")
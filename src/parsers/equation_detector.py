@@ -1,10 +1,12 @@
 """
 src/parsers/equation_detector.py
 
-Detect equation-like regions inside images (or PDF page images).
+Detect equation-like regions inside images (or PDF page images),
+plus a lightweight line-based detector for extracted page text.
 - Uses classical CV (grayscale -> adaptive threshold -> morphology -> contours)
 - Filters contours by aspect, area, and stroke density heuristics
-- Returns list of crops and optional OCR using pytesseract (best-effort)
+- Returns list of crops and optional OCR (best-effort): in-process via
+  tesserocr when installed, otherwise batched through the pytesseract CLI
 - Intended to be a preprocessor for a stronger math OCR (pix2tex / MathPix)
 """
 
@@ -12,8 +14,24 @@ import cv2
 import numpy as np
 from PIL import Image
 import os
+import re
+import tempfile
+import threading
 import pytesseract
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+# In-process Tesseract: the model is loaded once, on first OCR call, instead of
+# per subprocess. psm SINGLE_BLOCK == --psm 6. One API handle, so calls are serialized.
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    _TESS_AVAILABLE = True
+except ImportError:
+    _TESS_AVAILABLE = False
+_TESS = None
+_TESS_LOCK = threading.Lock()
+
+# Structuring element for the 25×3 close, built once
+_KERNEL_CLOSE = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 3))
 
 
 def _ensure_dir(path: str):
@@ -26,17 +44,19 @@ def _to_gray(img: np.ndarray) -> np.ndarray:
     return img
 
 
-def _binarize(gray: np.ndarray) -> np.ndarray:
+def _binarize(gray: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
     # Use adaptive threshold — good for variable lighting
     return cv2.adaptiveThreshold(gray, 255,
                                  cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                 cv2.THRESH_BINARY_INV, 25, 10)
+                                 cv2.THRESH_BINARY_INV, 25, 10, dst=dst)
 
 
-def _morph_close(bin_img: np.ndarray, kx: int = 15, ky: int = 3) -> np.ndarray:
-    # Close gaps horizontally to join long equations or inline math
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kx, ky))
-    return cv2.morphologyEx(bin_img, cv2.MORPH_CLOSE, kernel)
+def _morph_close(bin_img: np.ndarray, kernel: np.ndarray = _KERNEL_CLOSE,
+                 tmp: Optional[np.ndarray] = None) -> np.ndarray:
+    # Close gaps horizontally to join long equations or inline math.
+    # Writes the result into tmp when given; bin_img is left untouched.
+    # Accepts np.ndarray or cv2.UMat (tmp of the same kind, or None).
+    return cv2.morphologyEx(bin_img, cv2.MORPH_CLOSE, kernel, dst=tmp)
 
 
 def _find_candidate_contours(mask: np.ndarray) -> List[np.ndarray]:
@@ -44,70 +64,140 @@ def _find_candidate_contours(mask: np.ndarray) -> List[np.ndarray]:
     return contours
 
 
-def _is_equation_like(contour: np.ndarray, img_shape: Tuple[int, int]) -> bool:
-    x, y, w, h = cv2.boundingRect(contour)
+def _equation_like_mask(rects: np.ndarray, img_shape: Tuple[int, int]) -> np.ndarray:
+    """Evaluate the equation heuristics on an (N, 4) x, y, w, h array at once; returns a bool mask."""
+    w = rects[:, 2].astype(np.int64)
+    h = rects[:, 3].astype(np.int64)
     img_h, img_w = img_shape[:2]
 
     # Heuristics:
     # - Minimum area
-    area = w * h
-    if area < 400:  # too small
-        return False
+    keep = w * h >= 400
 
     # - Not a full-page box
-    if w > img_w * 0.95 and h > img_h * 0.95:
-        return False
+    keep &= ~((w > img_w * 0.95) & (h > img_h * 0.95))
 
     # - Aspect ratio: equations often are wide or tall with fractions; accept wider boxes too
     ar = w / (h + 1e-6)
-    if ar < 0.2 and ar > 10:
-        return False
+    keep &= (ar >= 0.2) & (ar <= 10)
 
     # - Accept typical eq sizes
-    if h < 10 or w < 10:
-        return False
+    keep &= (h >= 10) & (w >= 10)
+
+    return keep
 
-    return True
+
+def _ocr_crops_in_process(crops: List[np.ndarray]) -> List[str]:
+    """
+    OCR crops (BGR or grayscale) through the shared tesserocr handle,
+    created on the first call. Raises ImportError / RuntimeError when
+    tesserocr is missing or cannot initialize.
+    """
+    global _TESS, _TESS_AVAILABLE
+    texts = []
+    with _TESS_LOCK:
+        if _TESS is None:
+            if not _TESS_AVAILABLE:
+                raise ImportError("tesserocr is not installed")
+            try:
+                _TESS = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK)
+            except RuntimeError:
+                # e.g. no tessdata found; don't retry on every image
+                _TESS_AVAILABLE = False
+                raise
+        for crop in crops:
+            _TESS.SetImage(Image.fromarray(crop if len(crop.shape) == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)))
+            texts.append(_TESS.GetUTF8Text().strip())
+    return texts
+
+
+def _ocr_crops(crops: List[np.ndarray], config: str = r'--psm 6') -> List[str]:
+    """
+    OCR all crops with a single tesseract run: crops are written to a scratch
+    dir and passed as an image-list file, so tesseract starts up once instead
+    of once per crop. Output pages are split on the form-feed separator.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i, crop in enumerate(crops):
+            path = os.path.join(tmp_dir, f"crop_{i:03d}.png")
+            cv2.imwrite(path, crop)
+            paths.append(path)
+
+        list_path = os.path.join(tmp_dir, "images.txt")
+        with open(list_path, "w") as f:
+            f.write("\n".join(paths) + "\n")
+
+        texts = pytesseract.image_to_string(list_path, config=config).split("\f")
+
+        # Older tesseract versions also terminate the last page with \f
+        if len(texts) == len(crops) + 1 and not texts[-1].strip():
+            texts = texts[:-1]
+
+        if len(texts) != len(crops):
+            # Can't map pages back to crops — OCR them one by one
+            texts = [pytesseract.image_to_string(p, config=config) for p in paths]
+
+    return [t.strip() for t in texts]
 
 
 def detect_equations_in_image(img: np.ndarray,
                               save_crops: bool = False,
                               out_dir: str = "data/equation_crops",
-                              ocr: bool = True) -> List[Dict]:
+                              ocr: bool = True,
+                              gray: Optional[np.ndarray] = None) -> List[Dict]:
     """
     Detect equation regions in an image (numpy array, BGR or grayscale).
+    Pass a precomputed uint8 grayscale as `gray` to skip the conversion.
     Returns list of dicts:
     {
        "bbox": (x,y,w,h),
-       "crop": np.ndarray,
+       "crop": np.ndarray (view into img — .copy() before modifying),
        "saved_path": optional path,
        "tesseract_text": optional OCR text
     }
     """
     _ensure_dir(out_dir) if save_crops else None
 
-    gray = _to_gray(img)
-    bin_img = _binarize(gray)
-    closed = _morph_close(bin_img, kx=25, ky=3)
+    if gray is None:
+        gray = _to_gray(img)
+    # Two page-sized scratch buffers shared by threshold + morphology.
+    # With OpenCL available, run them on UMat so OpenCV's T-API dispatches
+    # to the GPU; otherwise plain arrays on the CPU SIMD paths.
+    if cv2.ocl.useOpenCL():
+        src = cv2.UMat(gray)
+        buf1, buf2 = (cv2.UMat(gray.shape[0], gray.shape[1], cv2.CV_8UC1) for _ in range(2))
+    else:
+        src = gray
+        buf1, buf2 = np.empty_like(gray), np.empty_like(gray)
+    bin_img = _binarize(src, dst=buf1)
+    closed = _morph_close(bin_img, tmp=buf2)
+    if isinstance(closed, cv2.UMat):
+        # contours are traced on the CPU
+        closed = closed.get()
 
     contours = _find_candidate_contours(closed)
     candidates = []
 
-    # sort contours left->right, top->bottom (helpful when saving)
-    contours = sorted(contours, key=lambda c: cv2.boundingRect(c)[1] * img.shape[1] + cv2.boundingRect(c)[0])
+    # bounding rects once, as an (N, 4) array of x, y, w, h
+    rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
 
-    for idx, c in enumerate(contours):
-        if not _is_equation_like(c, img.shape):
-            continue
+    # sort left->right, top->bottom (helpful when saving)
+    keys = rects[:, 1].astype(np.int64) * img.shape[1] + rects[:, 0]
+    order = np.argsort(keys, kind="stable")
 
-        x, y, w, h = cv2.boundingRect(c)
+    # idx is the rank in sorted order (used for crop filenames)
+    keep = _equation_like_mask(rects, img.shape)[order]
+    for idx in np.flatnonzero(keep):
+        x, y, w, h = (int(v) for v in rects[order[idx]])
         margin_x = int(w * 0.03)  # small margin
         margin_y = int(h * 0.05)
         x0 = max(0, x - margin_x)
         y0 = max(0, y - margin_y)
         x1 = min(img.shape[1], x + w + margin_x)
         y1 = min(img.shape[0], y + h + margin_y)
-        crop = img[y0:y1, x0:x1].copy()
+        # A view — nothing below writes into it (imwrite / OCR only read)
+        crop = img[y0:y1, x0:x1]
 
         entry = {
             "bbox": (x0, y0, x1 - x0, y1 - y0),
@@ -120,23 +210,59 @@ def detect_equations_in_image(img: np.ndarray,
             cv2.imwrite(path, crop)
             entry["saved_path"] = path
 
-        if ocr:
+        candidates.append(entry)
+
+    if ocr and candidates:
+        try:
+            # Use Tesseract with a math-friendly config (best-effort)
+            # psm 6: Assume a single uniform block of text; OEM 3 default
+            crops = [entry["crop"] for entry in candidates]
             try:
-                # Use Tesseract with a math-friendly config (best-effort)
-                pil = Image.fromarray(crop if len(crop.shape) == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
-                # psm 6: Assume a single uniform block of text; OEM 3 default
-                custom_config = r'--psm 6'
-                txt = pytesseract.image_to_string(pil, config=custom_config)
-                entry["tesseract_text"] = txt.strip()
-            except Exception as e:
+                texts = _ocr_crops_in_process(crops)
+            except (ImportError, RuntimeError):
+                texts = _ocr_crops(crops, config=r'--psm 6')
+            for entry, txt in zip(candidates, texts):
+                entry["tesseract_text"] = txt
+        except Exception as e:
+            for entry in candidates:
                 entry["tesseract_text"] = ""
                 entry["ocr_error"] = str(e)
 
-        candidates.append(entry)
-
     return candidates
 
 
+# Math operators / symbols counted towards a line's "mathiness"
+_MATH_CHARS = set("=+-−×÷*/^<>≤≥≈≠±∞∑∏∫∂∇√·")
+# LaTeX-style inline math or commands
+_LATEX_RE = re.compile(r"\$[^$]+\$|\\(frac|sum|int|sqrt|prod|lim|alpha|beta|gamma|theta|lambda|sigma|pi)\b")
+
+
+def detect_equations_in_text(text: str, min_math_ratio: float = 0.3) -> List[Dict]:
+    """
+    Flag lines of extracted text that look like equations (best-effort).
+    A line qualifies if it contains LaTeX-style math, or contains "=" and
+    at least min_math_ratio of its non-space chars are digits / math symbols.
+    Returns list of dicts: {"line": int (0-based), "text": str}
+    """
+    equations = []
+
+    for idx, line in enumerate(text.splitlines()):
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        if _LATEX_RE.search(stripped):
+            equations.append({"line": idx, "text": stripped})
+            continue
+
+        chars = [c for c in stripped if not c.isspace()]
+        math = sum(1 for c in chars if c in _MATH_CHARS or c.isdigit())
+        if "=" in stripped and math / len(chars) >= min_math_ratio:
+            equations.append({"line": idx, "text": stripped})
+
+    return equations
+
+
 def detect_equations_from_pdf_page_image(page_image_path: str,
                                          save_crops: bool = True,
                                          out_dir: str = "data/equation_crops",
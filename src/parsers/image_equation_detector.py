@@ -5,27 +5,29 @@ Outputs bounding boxes of potential equations.
 
 import cv2
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def detect_equations_in_image(img_array: np.ndarray) -> List[Dict[str, int]]:
+def detect_equations_in_image(img_array: Optional[np.ndarray] = None,
+                              gray: Optional[np.ndarray] = None) -> List[Dict[str, int]]:
     """
-    Input: numpy array image
+    Input: numpy array image (BGR), or a precomputed uint8 grayscale via `gray`
+           (img_array is not read then and may be None)
     Output: list of bounding boxes {"x": x, "y": y, "w": w, "h": h}
     """
-    gray = cv2.cvtColor(img_array, cv2.COLOR_BGR2GRAY)
+    if gray is None:
+        gray = cv2.cvtColor(img_array, cv2.COLOR_BGR2GRAY)
     # Apply adaptive threshold
     thresh = cv2.adaptiveThreshold(gray, 255,
                                    cv2.ADAPTIVE_THRESH_MEAN_C,
                                    cv2.THRESH_BINARY_INV, 15, 10)
     # Find contours
     contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # bounding rects once, as an (N, 4) array of x, y, w, h
+    rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
 
-    boxes = []
-    for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
-        # Filter by size: likely equation areas
-        if w > 30 and h > 10:  # tweak thresholds for your documents
-            boxes.append({"x": x, "y": y, "w": w, "h": h})
+    # Filter by size: likely equation areas
+    keep = (rects[:, 2] > 30) & (rects[:, 3] > 10)  # tweak thresholds for your documents
+    boxes = [{"x": x, "y": y, "w": w, "h": h} for x, y, w, h in rects[keep].tolist()]
 
     return boxes
 
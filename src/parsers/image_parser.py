@@ -5,42 +5,102 @@ Extracts images from PDF using pdfplumber.
 Returns image bytes or numpy arrays.
 """
 
-from typing import List, Dict, Any
+from typing import List, Optional, Tuple
 import pdfplumber
 from PIL import Image
 import io
 import numpy as np
 
+from src.utils.records import Record
 
-def extract_images(pdf_path: str) -> List[Dict[str, Any]]:
+
+class PageImage(Record):
+    """
+    One extracted image. The PIL crop is kept as-is; the numpy arrays are
+    only materialized (then cached) the first time they are accessed, so
+    images nobody looks at never pay for the array copies.
+    Unrendered images (render=False) have image = None and no arrays.
+    """
+
+    __slots__ = ("page", "bbox", "image", "_np", "_gray")
+    KEYS = ("page", "bbox", "image", "numpy_array", "gray")
+
+    def __init__(self, page: int, bbox: Tuple[float, float, float, float],
+                 image: Optional[Image.Image] = None):
+        self.page = page
+        self.bbox = bbox
+        self.image = image
+        self._np = None
+        self._gray = None
+
+    @property
+    def numpy_array(self) -> Optional[np.ndarray]:
+        if self._np is None and self.image is not None:
+            self._np = np.array(self.image)
+        return self._np
+
+    @property
+    def gray(self) -> Optional[np.ndarray]:
+        # uint8 grayscale, shared by the equation detectors
+        if self._gray is None and self.image is not None:
+            self._gray = np.array(self.image.convert("L"))
+        return self._gray
+
+
+def extract_page_images(page: pdfplumber.page.Page, page_num: int,
+                        render: bool = True) -> List[PageImage]:
+    """
+    Extract images from a single pdfplumber page.
+    Same records as extract_images; with render=False the page is not
+    rasterized and each PageImage only carries page + bbox.
+    """
+    results = []
+
+    if render and page.images:
+        # Rasterize the page once at 300 DPI, then crop every image out of it
+        page_img = page.to_image(resolution=300).original
+        scale = page_img.width / page.width
+        px0, ptop = page.bbox[0], page.bbox[1]
+
+    for img in page.images:
+        x0, y0, x1, y1 = img["x0"], img["y0"], img["x1"], img["y1"]
+
+        if not render:
+            results.append(PageImage(page_num, (x0, y0, x1, y1)))
+            continue
+
+        # Crop the image from the page render (pixel rows run top-down)
+        pix_bbox = (
+            max(0, round((x0 - px0) * scale)),
+            max(0, round((img["top"] - ptop) * scale)),
+            min(page_img.width, round((x1 - px0) * scale)),
+            min(page_img.height, round((img["bottom"] - ptop) * scale))
+        )
+        pil_image = page_img.crop(pix_bbox)
+
+        results.append(PageImage(page_num, (x0, y0, x1, y1), pil_image))
+
+    return results
+
+
+def extract_images(pdf_path: str) -> List[PageImage]:
     """
     Extract images from all PDF pages.
 
-    Returns list of:
+    Returns list of PageImage, accessible as:
     {
         "page": int,
         "bbox": (x0, y0, x1, y1),
         "image": PIL.Image,
-        "numpy_array": np.ndarray
+        "numpy_array": np.ndarray (RGB, lazy),
+        "gray": np.ndarray (uint8 grayscale, lazy)
     }
     """
     results = []
 
     with pdfplumber.open(pdf_path) as pdf:
         for page_num, page in enumerate(pdf.pages, start=1):
-            for img in page.images:
-                x0, y0, x1, y1 = img["x0"], img["y0"], img["x1"], img["y1"]
-                
-                # Crop the image from the page
-                cropped = page.within_bbox((x0, y0, x1, y1)).to_image(resolution=300)
-                pil_image = cropped.original
-
-                results.append({
-                    "page": page_num,
-                    "bbox": (x0, y0, x1, y1),
-                    "image": pil_image,
-                    "numpy_array": np.array(pil_image)
-                })
+            results.extend(extract_page_images(page, page_num))
 
     return results
 
@@ -19,7 +19,11 @@ def extract_text_pages(pdf_path: str) -> List[str]:
     try:
         with pdfplumber.open(pdf_path) as pdf:
             for page in pdf.pages:
-                text = page.extract_text() or ""
+                # Skip text reconstruction on pages without chars (scans, figures)
+                if not page.chars:
+                    text = ""
+                else:
+                    text = page.extract_text() or ""
                 pages.append(text)
     except Exception as e:
         raise RuntimeError(f"Failed to extract pages from {pdf_path}: {e}")
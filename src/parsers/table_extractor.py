@@ -6,21 +6,65 @@ Outputs clean, structured tables as lists of rows (CSV-like)
 and can optionally convert them into Pandas DataFrames.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 import pdfplumber
 import pandas as pd
 
+from src.utils.records import Record
 
-def extract_tables(pdf_path: str, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+
+def _table_to_df(table: List[List[str]]) -> pd.DataFrame:
+    # Convert to DataFrame (smart header detection)
+    df = pd.DataFrame(table)
+
+    # If first row looks like header → set as header
+    if df.iloc[0].isnull().sum() == 0:
+        df.columns = df.iloc[0]
+        df = df[1:].reset_index(drop=True)
+
+    return df
+
+
+class Table(Record):
+    """
+    One extracted table. The DataFrame is only built (then cached) the
+    first time as_dataframe is accessed, keeping it off the extraction path.
+    """
+
+    __slots__ = ("page", "table_index", "data", "_df")
+    KEYS = ("page", "table_index", "data", "as_dataframe")
+
+    def __init__(self, page: int, table_index: int, data: List[List[str]]):
+        self.page = page
+        self.table_index = table_index
+        self.data = data
+        self._df = None
+
+    @property
+    def as_dataframe(self) -> pd.DataFrame:
+        if self._df is None:
+            self._df = _table_to_df(self.data)
+        return self._df
+
+
+def extract_page_tables(page: pdfplumber.page.Page, page_num: int) -> List[Table]:
+    """
+    Extract tables from a single pdfplumber page.
+    Same records as extract_tables.
+    """
+    return [Table(page_num, idx, table) for idx, table in enumerate(page.extract_tables())]
+
+
+def extract_tables(pdf_path: str, max_pages: Optional[int] = None) -> List[Table]:
     """
     Extract tables from a PDF using pdfplumber.
 
-    Returns list of:
+    Returns list of Table, accessible as:
     {
        "page": int,
        "table_index": int,
        "data": List[List[str]],
-       "as_dataframe": pd.DataFrame
+       "as_dataframe": pd.DataFrame (lazy)
     }
     """
     results = []
@@ -29,23 +73,7 @@ def extract_tables(pdf_path: str, max_pages: Optional[int] = None) -> List[Dict[
         pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
 
         for page_num, page in enumerate(pages, start=1):
-            tables = page.extract_tables()
-
-            for idx, table in enumerate(tables):
-                # Convert to DataFrame (smart header detection)
-                df = pd.DataFrame(table)
-
-                # If first row looks like header → set as header
-                if df.iloc[0].isnull().sum() == 0:
-                    df.columns = df.iloc[0]
-                    df = df[1:].reset_index(drop=True)
-
-                results.append({
-                    "page": page_num,
-                    "table_index": idx,
-                    "data": table,
-                    "as_dataframe": df
-                })
+            results.extend(extract_page_tables(page, page_num))
 
     return results
 
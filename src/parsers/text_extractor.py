@@ -8,7 +8,43 @@ Handles:
 """
 
 from typing import List
+import numpy as np
 import pdfplumber
+from pdfplumber.utils import extract_text
+
+def extract_page_text(page: pdfplumber.page.Page, columns: int = 2) -> str:
+    """
+    Extract text from a single pdfplumber page, column by column.
+    columns <= 1 falls back to plain page.extract_text().
+    """
+    # Image-only / scanned page: skip text reconstruction entirely
+    if not page.chars:
+        return ""
+
+    if columns <= 1:
+        return page.extract_text() or ""
+
+    width = page.width
+    # Calculate column widths
+    col_width = width / columns
+
+    # Bucket chars into columns by x-midpoint — one pass over page.chars
+    # instead of a within_bbox crop (and char scan) per column
+    chars = page.chars
+    mids = np.fromiter(((c["x0"] + c["x1"]) / 2 for c in chars), dtype=np.float32, count=len(chars))
+    col_idx = np.clip((mids // col_width).astype(np.int32), 0, columns - 1)
+
+    # Extract text column by column
+    column_texts = []
+    for i in range(columns):
+        col_chars = [chars[j] for j in np.flatnonzero(col_idx == i)]
+        if not col_chars:
+            continue
+        column_texts.append(extract_text(col_chars).strip())
+
+    # Combine column texts in left->right order ("" for pages without text)
+    return "\n".join(column_texts).strip()
+
 
 def extract_text_from_pdf(pdf_path: str, columns: int = 2) -> List[str]:
     """
@@ -25,29 +61,7 @@ def extract_text_from_pdf(pdf_path: str, columns: int = 2) -> List[str]:
 
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
-            page_text = ""
-
-            # If the page has no text, skip
-            if page.extract_text() is None:
-                pages_text.append("")
-                continue
-
-            width = page.width
-            # Calculate column widths
-            col_width = width / columns
-
-            # Extract text column by column
-            column_texts = []
-            for i in range(columns):
-                left = i * col_width
-                right = (i + 1) * col_width
-                col_bbox = (left, 0, right, page.height)
-                col_text = page.within_bbox(col_bbox).extract_text() or ""
-                column_texts.append(col_text.strip())
-
-            # Combine column texts in left->right order
-            page_text = "\n".join(column_texts).strip()
-            pages_text.append(page_text)
+            pages_text.append(extract_page_text(page, columns))
 
     return pages_text
 
@@ -0,0 +1,217 @@
+"""
+src/pipeline.py
+
+Three-stage threaded pipeline: parse → detect → OCR.
+Each stage runs in its own thread, connected by bounded queues, so
+pdfplumber parsing of one page overlaps OpenCV equation detection and
+OCR of the pages before it.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pdfplumber
+
+from src.parsers.combined import extract_page
+from src.parsers.equation_detector import detect_equations_in_text
+from src.parsers.image_equation_detector import detect_equations_in_image
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class _Source:
+    """Reads a stage's input queue and remembers whether the end marker was seen."""
+
+    def __init__(self, q: queue.Queue):
+        self.q = q
+        self.exhausted = False
+
+    def get(self, timeout: Optional[float] = None):
+        item = self.q.get(timeout=timeout)  # raises queue.Empty on timeout
+        if item is _DONE:
+            self.exhausted = True
+        return item
+
+    def __iter__(self):
+        while True:
+            item = self.get()
+            if item is _DONE:
+                return
+            yield item
+
+    def drain(self):
+        # Throw away whatever is left so upstream stages never block on a
+        # full queue; once stopped, upstream sends the end marker promptly
+        while not self.exhausted:
+            self.get()
+
+
+def _parse_stage(q_out: queue.Queue, stop: threading.Event,
+                 pdf_path: str, extract_kwargs: Dict[str, Any]):
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages, start=1):
+            if stop.is_set():
+                return
+            q_out.put((page_num, extract_page(page, page_num, **extract_kwargs)))
+
+
+def _detect_image(img) -> List[Dict[str, int]]:
+    # gray only — the RGB array is materialized later, and only for OCR crops
+    return detect_equations_in_image(gray=img["gray"])
+
+
+def _detect_stage(source: _Source, q_out: queue.Queue, stop: threading.Event,
+                  eq_text: bool, eq_image: bool, max_inflight: int):
+    # Image detection fans out to a thread pool (OpenCV releases the GIL), with
+    # up to max_inflight pages in flight; pages still leave in page order
+    inflight = deque()
+
+    def emit(page_num, page, futures):
+        page["image_eqs"] = [(img, f.result()) for img, f in zip(page["images"], futures)]
+        q_out.put((page_num, page))
+
+    pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    try:
+        for page_num, page in source:
+            if stop.is_set():
+                return
+            page["equations_text"] = detect_equations_in_text(page["text"]) if eq_text else []
+            futures = [pool.submit(_detect_image, img) for img in page["images"]] if eq_image else []
+            inflight.append((page_num, page, futures))
+
+            while inflight and (len(inflight) > max_inflight
+                                or all(f.done() for f in inflight[0][2])):
+                emit(*inflight.popleft())
+
+        while inflight and not stop.is_set():
+            emit(*inflight.popleft())
+    finally:
+        # When stopped, queued detections are dropped rather than run
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _ocr_pages(pages: List[Tuple[int, Dict[str, Any]]],
+               ocr: Callable[[List[np.ndarray]], List[str]]):
+    # One OCR call for every equation crop in the batch of pages
+    crops, targets = [], []
+    for _, page in pages:
+        for img, boxes in page["image_eqs"]:
+            for b in boxes:
+                crops.append(img["numpy_array"][b["y"]:b["y"] + b["h"], b["x"]:b["x"] + b["w"]])
+                targets.append(b)
+    if crops:
+        for b, txt in zip(targets, ocr(crops)):
+            b["ocr_text"] = txt
+
+
+def _ocr_stage(source: _Source, q_out: queue.Queue, stop: threading.Event,
+               ocr: Optional[Callable[[List[np.ndarray]], List[str]]],
+               batch_size: int, timeout: float):
+    if ocr is None:
+        for item in source:
+            if stop.is_set():
+                return
+            q_out.put(item)
+        return
+
+    # Flush once batch_size pages are pending, or timeout seconds after the
+    # first pending page arrived — whichever comes first
+    pending = []
+    deadline = 0.0
+    while not source.exhausted:
+        if stop.is_set():
+            return  # pending pages are dropped un-OCR'd
+        try:
+            wait = max(0.0, deadline - time.monotonic()) if pending else None
+            item = source.get(timeout=wait)
+        except queue.Empty:
+            item = None
+
+        if item is not None and item is not _DONE:
+            if not pending:
+                deadline = time.monotonic() + timeout
+            pending.append(item)
+
+        if pending and (item is None or item is _DONE or len(pending) >= batch_size):
+            _ocr_pages(pending, ocr)
+            for p in pending:
+                q_out.put(p)
+            pending = []
+
+
+def _run_stage(target: Callable, source: Optional[_Source], q_out: queue.Queue,
+               stop: threading.Event, errors: List[BaseException], *args):
+    try:
+        if source is None:
+            target(q_out, stop, *args)
+        else:
+            target(source, q_out, stop, *args)
+    except BaseException as e:
+        errors.append(e)
+        # No point finishing the document once a stage has failed
+        stop.set()
+    finally:
+        if source is not None:
+            source.drain()
+        q_out.put(_DONE)
+
+
+def run_pipeline(pdf_path: str,
+                 eq_text: bool = True,
+                 eq_image: bool = True,
+                 ocr: Optional[Callable[[List[np.ndarray]], List[str]]] = None,
+                 queue_size: int = 4,
+                 ocr_batch_size: int = 8,
+                 ocr_timeout: float = 0.5,
+                 **extract_kwargs) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Run parse → detect → OCR over a PDF and yield (page_num, page) in page order.
+
+    Args:
+        pdf_path: Path to PDF file
+        eq_text: Run text-based equation detection
+        eq_image: Run image-based equation detection
+        ocr: Optional callable OCR-ing a list of crops; fills "ocr_text" on each box
+        queue_size: Max pages buffered between two stages (and in flight in detection)
+        ocr_batch_size / ocr_timeout: OCR flushes at this many pages or after this many seconds
+        **extract_kwargs: Forwarded to extract_page (columns, text, tables, images)
+
+    Each page is the extract_page dict plus:
+        "equations_text": list, "image_eqs": [(image record, equation boxes), ...]
+    """
+    parsed, detected, done = (queue.Queue(maxsize=queue_size) for _ in range(3))
+    errors: List[BaseException] = []
+    stop = threading.Event()
+    detect_src, ocr_src, out_src = _Source(parsed), _Source(detected), _Source(done)
+
+    threads = [
+        threading.Thread(target=_run_stage, daemon=True,
+                         args=(_parse_stage, None, parsed, stop, errors, pdf_path, extract_kwargs)),
+        threading.Thread(target=_run_stage, daemon=True,
+                         args=(_detect_stage, detect_src, detected, stop, errors, eq_text, eq_image, queue_size)),
+        threading.Thread(target=_run_stage, daemon=True,
+                         args=(_ocr_stage, ocr_src, done, stop, errors, ocr, ocr_batch_size, ocr_timeout)),
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        for item in out_src:
+            yield item
+    finally:
+        # Also reached when the consumer stops early (e.g. a Streamlit rerun):
+        # stop the stages after their current page instead of finishing the PDF
+        stop.set()
+        out_src.drain()
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
@@ -6,12 +6,16 @@ import easyocr
 
 
 class ImagePreprocessor:
-    def __init__(self, use_easyocr=True, use_tesseract=True):
+    # Batched EasyOCR only beats sequential OCR from roughly this many crops
+    BATCHED_OCR_MIN_CROPS = 15
+
+    def __init__(self, use_easyocr=True, use_tesseract=True, gpu=False):
         self.use_easyocr = use_easyocr
         self.use_tesseract = use_tesseract
+        self._warmed_up = False
 
         if self.use_easyocr:
-            self.reader = easyocr.Reader(['en'], gpu=False)
+            self.reader = easyocr.Reader(['en'], gpu=gpu, cudnn_benchmark=gpu)
 
     # -------------------------
     # Load image
@@ -93,6 +97,32 @@ class ImagePreprocessor:
         text = pytesseract.image_to_string(Image.fromarray(img))
         return text
 
+    # -------------------------
+    # Batched OCR over many crops
+    # -------------------------
+    def ocr_easyocr_batched(self, crops, batch_size=16, n_width=800, n_height=600):
+        # Crops are resized to a common shape so they can share batches;
+        # one dummy batch first so cudnn autotuning isn't paid on real data
+        if not self._warmed_up:
+            warmup = np.zeros([batch_size, n_height, n_width, 3], dtype=np.uint8)
+            self.reader.readtext_batched(warmup, n_width=n_width, n_height=n_height,
+                                         batch_size=batch_size, detail=0)
+            self._warmed_up = True
+
+        results = self.reader.readtext_batched(crops, n_width=n_width, n_height=n_height,
+                                               batch_size=batch_size, detail=0)
+        return ["\n".join(r) for r in results]
+
+    def ocr_crops(self, crops):
+        # Batched EasyOCR when it pays off (GPU + enough crops),
+        # otherwise sequential Tesseract
+        use_batched = (self.use_easyocr
+                       and self.reader.device != "cpu"
+                       and len(crops) >= self.BATCHED_OCR_MIN_CROPS)
+        if use_batched:
+            return self.ocr_easyocr_batched(crops)
+        return [self.ocr_tesseract(c).strip() for c in crops]
+
     # -------------------------
     # Unified OCR
     # -------------------------
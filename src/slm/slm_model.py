@@ -3,6 +3,7 @@ Simple Small Language Model (SLM) for tagging and section analysis.
 """
 
 from typing import Dict, Any
+import ahocorasick
 
 KEYWORDS = {
     "introduction": "section:introduction",
@@ -13,6 +14,12 @@ KEYWORDS = {
     "equation": "contains:math"
 }
 
+# All keywords in one automaton — a single pass over the text finds every match
+_AUTOMATON = ahocorasick.Automaton()
+for _k, _v in KEYWORDS.items():
+    _AUTOMATON.add_word(_k, _v)
+_AUTOMATON.make_automaton()
+
 
 def encode(text: str):
     return text.lower().strip()
@@ -20,11 +27,9 @@ def encode(text: str):
 
 def tag(text: str) -> Dict[str, Any]:
     encoded = encode(text)
-    labels = []
-
-    for k, v in KEYWORDS.items():
-        if k in encoded:
-            labels.append(v)
+    found = {v for _, v in _AUTOMATON.iter(encoded)}
+    # Keep KEYWORDS order so labels stay deterministic
+    labels = [v for v in KEYWORDS.values() if v in found]
 
     return {
         "text": text,
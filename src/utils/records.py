@@ -0,0 +1,30 @@
+"""
+Shared base for the lightweight record objects returned by the parsers.
+"""
+
+from typing import Any, Tuple
+
+
+class Record:
+    """
+    Read-only dict-style access (rec["page"], "bbox" in rec, rec.get(...))
+    to the public fields listed in KEYS. Subclasses define their own
+    __slots__ and KEYS; private slots are never exposed as keys.
+    """
+
+    __slots__ = ()
+    KEYS: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.KEYS
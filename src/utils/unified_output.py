@@ -14,6 +14,7 @@ def build_page_json(
     equations_img: list = None
 ) -> dict:
     """
+    tables / images: this page's records only (callers slice per page)
     equations_img: optional list of dicts for equations detected in images
     """
     return {
@@ -21,14 +22,14 @@ def build_page_json(
         "text": text,
         "tables": [
             {"table_index": t["table_index"], "data": t["data"]}
-            for t in tables if t["page"] == page_num
+            for t in tables
         ],
         "images": [
             {
                 "bbox": img["bbox"],
                 "equations_in_image": equations_img if equations_img else []
             }
-            for img in images if img["page"] == page_num
+            for img in images
         ],
         "equations": equations_text
     }